@@ -14,13 +14,16 @@ Notes on database location:
 
 from __future__ import annotations
 
+import atexit
 import os
-import re
 import sys
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import datetime
+from functools import lru_cache
 from typing import Optional, List, Tuple, Iterable
 
 import tkinter as tk
@@ -31,6 +34,7 @@ APP_NAME = "CETI Visitor Card Tracker"
 DB_FILENAME = "cards.db"
 
 
+@lru_cache(maxsize=None)
 def app_dir() -> str:
     """Return the folder containing the running script or packaged executable."""
     if getattr(sys, "frozen", False):
@@ -41,42 +45,181 @@ def app_dir() -> str:
 DB_PATH = os.path.join(app_dir(), DB_FILENAME)
 
 
+@lru_cache(maxsize=None)
 def resource_path(rel_path: str) -> str:
     """Resolve resource path for PyInstaller builds."""
     base = getattr(sys, "_MEIPASS", app_dir())
     return os.path.join(base, rel_path)
 
 
+ICON_PATH = resource_path("icon.ico")
+
+
 def now_str() -> str:
-    return datetime.now().strftime("%Y-%m-%d %H:%M")
+    # time.strftime formats straight from the C tm struct — no datetime
+    # object per call. Output is unchanged ("YYYY-MM-DD HH:MM").
+    return time.strftime("%Y-%m-%d %H:%M")
+
+
+def valid_code(code: str) -> bool:
+    """True if the optional card ID is exactly 4 digits."""
+    return len(code) == 4 and code.isdigit()
+
+
+# One cached connection per thread. Opening a connection re-runs every PRAGMA
+# and re-opens the file, which dominates the cost of fast UI queries, so the
+# handle is created once and reused for the life of the thread.
+_tls = threading.local()
+_all_conns: List[sqlite3.Connection] = []
+_all_conns_lock = threading.Lock()
+
+
+def get_conn() -> sqlite3.Connection:
+    """Return this thread's cached connection, creating it on first use."""
+    conn = getattr(_tls, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(
+            DB_PATH, timeout=10, check_same_thread=False, isolation_level=None
+        )
+        # One executescript instead of seven execute round-trips. The last
+        # three pragmas suit the read-heavy UI: mmap the file (fewer read
+        # syscalls), keep ~20MB of pages hot, temp sorts in memory.
+        conn.executescript(
+            """
+            PRAGMA journal_mode=WAL;
+            PRAGMA busy_timeout=10000;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA foreign_keys=ON;
+            PRAGMA mmap_size=134217728;
+            PRAGMA cache_size=-20000;
+            PRAGMA temp_store=MEMORY;
+            """
+        )
+        _tls.conn = conn
+        with _all_conns_lock:
+            _all_conns.append(conn)
+    return conn
+
+
+def _close_all() -> None:
+    with _all_conns_lock:
+        for conn in _all_conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _all_conns.clear()
+
+
+atexit.register(_close_all)
 
 
 @contextmanager
 def connect_db() -> Iterable[sqlite3.Connection]:
     """
     SQLite connection with pragmatic settings for multi-user read/write
-    on a shared folder.
+    on a shared folder. Yields the thread's persistent connection;
+    PRAGMAs run once per thread, not per call.
+
+    Because the handle outlives the block, an error must not leave it
+    holding an open transaction — roll back before re-raising.
     """
-    conn = sqlite3.connect(DB_PATH, timeout=10)
+    conn = get_conn()
     try:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA busy_timeout=10000;")
-        conn.execute("PRAGMA synchronous=NORMAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
         yield conn
-    finally:
-        conn.close()
+    except BaseException:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
+
+# Single background worker for DB calls issued by the UI. One worker keeps
+# SQLite access serialized (single-writer, less SQLITE_BUSY) while the Tk
+# event loop stays responsive even when cards.db sits on a slow shared drive.
+_db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+
+
+def _checkpoint_wal() -> None:
+    """Fold the WAL back into cards.db and truncate it (runs on the worker)."""
+    try:
+        get_conn().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except sqlite3.Error:
+        pass  # busy writers just mean the next checkpoint catches up
+
+
+def fetch_cards_async(search: str, status_filter: str, widget, callback) -> None:
+    """Run fetch_cards on the DB worker; deliver rows to callback on the Tk thread."""
+    fut = _db_executor.submit(fetch_cards, search, status_filter)
+
+    def _done(f) -> None:
+        try:
+            rows = f.result()
+        except sqlite3.Error:
+            # Transient failure (e.g. locked past the busy timeout): keep the
+            # last-known rows on screen rather than delivering an empty list
+            # that would blank the table.
+            return
+        try:
+            widget.after(0, callback, rows)
+        except tk.TclError:
+            pass  # widget destroyed before the query finished
+
+    fut.add_done_callback(_done)
+
+
+def fetch_history_async(
+    card_filter: str, holder_filter: str, last_seen_id, widget, callback
+) -> None:
+    """Run fetch_history_page on the DB worker; deliver rows to callback on the Tk thread."""
+    fut = _db_executor.submit(fetch_history_page, card_filter, holder_filter, last_seen_id)
+
+    def _done(f) -> None:
+        try:
+            rows = f.result()
+        except sqlite3.Error:
+            return  # as above: keep what's displayed instead of clearing it
+        try:
+            widget.after(0, callback, rows)
+        except tk.TclError:
+            pass
+
+    fut.add_done_callback(_done)
 
 
 # ======================
 #   DB INITIALIZATION
 # ======================
+# Set by ensure_db() when the FTS5 shadow tables are usable.
+_history_fts_enabled = False
+_cards_fts_enabled = False
+
+# Bump when ensure_db's schema changes; warm starts with a matching
+# PRAGMA user_version skip all the CREATE/ALTER work below.
+SCHEMA_VERSION = 5
+
+
 def ensure_db() -> None:
+    global _history_fts_enabled, _cards_fts_enabled
     os.makedirs(app_dir(), exist_ok=True)
     with connect_db() as conn:
         c = conn.cursor()
 
-        c.execute(
+        if c.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+            # Schema already current: one PRAGMA read instead of re-parsing
+            # every IF NOT EXISTS statement. Just recheck FTS availability.
+            names = {
+                row[0]
+                for row in c.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' "
+                    "AND name IN ('history_fts','cards_fts')"
+                )
+            }
+            _history_fts_enabled = "history_fts" in names
+            _cards_fts_enabled = "cards_fts" in names
+            return
+
+        # Both tables in one script: a single Python->C crossing for the DDL.
+        conn.executescript(
             """
             CREATE TABLE IF NOT EXISTS cards(
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -87,12 +230,8 @@ def ensure_db() -> None:
                 notes TEXT,
                 code TEXT,
                 home_location TEXT
-            )
-            """
-        )
+            );
 
-        c.execute(
-            """
             CREATE TABLE IF NOT EXISTS history(
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 card_label TEXT NOT NULL,
@@ -100,73 +239,226 @@ def ensure_db() -> None:
                 signed_out_at TEXT NOT NULL,
                 returned_at TEXT,
                 notes TEXT
-            )
+            );
             """
         )
 
-        # Add missing columns if upgrading from older DB
-        cols = {row[1] for row in c.execute("PRAGMA table_info(cards)").fetchall()}
+        # Add missing columns if upgrading from older DB (must run before the
+        # index script below, which references the migrated columns)
+        # table_xinfo, not table_info: the latter hides generated columns.
+        cols = {row[1] for row in c.execute("PRAGMA table_xinfo(cards)").fetchall()}
         if "code" not in cols:
             c.execute("ALTER TABLE cards ADD COLUMN code TEXT")
         if "home_location" not in cols:
             c.execute("ALTER TABLE cards ADD COLUMN home_location TEXT")
+        if "sort_prefix" not in cols:
+            # Natural-sort key ("Visitor 2" before "Visitor 10") computed by
+            # SQLite at write time. Virtual generated columns cost nothing to
+            # store; the index below materializes them so ORDER BY is a walk.
+            c.execute(
+                """
+                ALTER TABLE cards ADD COLUMN sort_prefix TEXT
+                GENERATED ALWAYS AS (lower(trim(rtrim(trim(label), '0123456789')))) VIRTUAL
+                """
+            )
+            c.execute(
+                """
+                ALTER TABLE cards ADD COLUMN sort_num INTEGER
+                GENERATED ALWAYS AS (
+                    CAST(substr(trim(label), length(rtrim(trim(label), '0123456789')) + 1) AS INTEGER)
+                ) VIRTUAL
+                """
+            )
 
-        c.execute(
+        # All indexes in one script:
+        # - idx_history_open: at most one open (unreturned) history row per
+        #   card, so return_card's close-the-open-row lookup stays O(1)
+        # - idx_cards_status_label: status-filtered refreshes seek instead of
+        #   scanning and sorting the whole table
+        # - idx_cards_out / idx_cards_lost: tiny dedicated B-trees for the
+        #   minority statuses
+        # - idx_cards_covering: every column fetch_cards selects, so listing
+        #   queries never touch the table heap
+        conn.executescript(
             """
             CREATE UNIQUE INDEX IF NOT EXISTS idx_cards_code_unique
-            ON cards(code) WHERE code IS NOT NULL
+                ON cards(code) WHERE code IS NOT NULL;
+
+            CREATE INDEX IF NOT EXISTS idx_history_card_label ON history(card_label);
+            CREATE INDEX IF NOT EXISTS idx_history_holder ON history(holder);
+            CREATE INDEX IF NOT EXISTS idx_history_returned ON history(returned_at);
+
+            CREATE INDEX IF NOT EXISTS idx_cards_holder ON cards(holder);
+            CREATE INDEX IF NOT EXISTS idx_history_open
+                ON history(card_label) WHERE returned_at IS NULL;
+
+            CREATE INDEX IF NOT EXISTS idx_cards_status_label ON cards(status, label);
+            CREATE INDEX IF NOT EXISTS idx_cards_out ON cards(label) WHERE status='Out';
+            CREATE INDEX IF NOT EXISTS idx_cards_lost ON cards(label) WHERE status='Lost';
+
+            CREATE INDEX IF NOT EXISTS idx_cards_covering
+                ON cards(status, label, code, holder, signed_out_at, notes, home_location);
+
+            CREATE INDEX IF NOT EXISTS idx_cards_sort ON cards(sort_prefix, sort_num);
             """
         )
-        c.execute("CREATE INDEX IF NOT EXISTS idx_history_card_label ON history(card_label)")
-        c.execute("CREATE INDEX IF NOT EXISTS idx_history_holder ON history(holder)")
 
-        conn.commit()
+        _ensure_history_fts(c)
+        _ensure_cards_fts(c)
 
+        c.execute("ANALYZE")
 
-def populate_default_cards() -> None:
-    """Seed a preset card set. Uses INSERT OR IGNORE to avoid duplicate seed runs."""
-    with connect_db() as conn:
-        c = conn.cursor()
+        c.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
-        for i in range(1, 11):
-            loc = "119-1 Cabinet" if i <= 4 else "118-2 Cabinet"
-            code = f"{1000 + i:04d}"
-            c.execute(
-                "INSERT OR IGNORE INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)",
-                (f"Lab Visitor {i}", code, loc),
-            )
+        conn.commit()
 
-        for i in range(1, 21):
-            code = f"{2000 + i:04d}"
-            loc = "Second Floor Admin" if i <= 10 else "Third Floor Admin"
-            c.execute(
-                "INSERT OR IGNORE INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)",
-                (f"Visitor {i}", code, loc),
-            )
 
+def _ensure_history_fts(c: sqlite3.Cursor) -> None:
+    """
+    Keep an FTS5 shadow of history so the History window's filters use an
+    inverted index instead of LIKE table scans. Skipped gracefully on SQLite
+    builds without FTS5 (the history queries fall back to LIKE).
+    """
+    global _history_fts_enabled
+    try:
+        existed = c.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='history_fts'"
+        ).fetchone()
         c.execute(
-            "INSERT OR IGNORE INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)",
-            ("JHSC", "3001", "118-1 Cabinet"),
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS history_fts
+            USING fts5(card_label, holder, notes, content='history', content_rowid='id')
+            """
+        )
+        c.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_history_fts_ai AFTER INSERT ON history BEGIN
+                INSERT INTO history_fts(rowid, card_label, holder, notes)
+                VALUES (new.id, new.card_label, new.holder, new.notes);
+            END
+            """
         )
         c.execute(
-            "INSERT OR IGNORE INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)",
-            ("PHE 2", "3002", "118-1 Cabinet"),
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_history_fts_ad AFTER DELETE ON history BEGIN
+                INSERT INTO history_fts(history_fts, rowid, card_label, holder, notes)
+                VALUES ('delete', old.id, old.card_label, old.holder, old.notes);
+            END
+            """
         )
         c.execute(
-            "INSERT OR IGNORE INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)",
-            ("Lab Manager Card", "9000", "Lab Manager's Office"),
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_history_fts_au AFTER UPDATE ON history BEGIN
+                INSERT INTO history_fts(history_fts, rowid, card_label, holder, notes)
+                VALUES ('delete', old.id, old.card_label, old.holder, old.notes);
+                INSERT INTO history_fts(rowid, card_label, holder, notes)
+                VALUES (new.id, new.card_label, new.holder, new.notes);
+            END
+            """
         )
+        if not existed:
+            # First time only: index whatever history already exists.
+            c.execute("INSERT INTO history_fts(history_fts) VALUES('rebuild')")
+        _history_fts_enabled = True
+    except sqlite3.OperationalError:
+        _history_fts_enabled = False
 
-        conn.commit()
+
+def _ensure_cards_fts(c: sqlite3.Cursor) -> None:
+    """
+    FTS5 shadow of cards for the main window's Search box, so the five-column
+    LIKE '%...%' scan becomes one inverted-index lookup. Same external-content
+    pattern and fallback behaviour as the history table above.
+    """
+    global _cards_fts_enabled
+    try:
+        existed = c.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='cards_fts'"
+        ).fetchone()
+        c.execute(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS cards_fts
+            USING fts5(label, holder, notes, code, home_location,
+                       content='cards', content_rowid='id')
+            """
+        )
+        c.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_cards_fts_ai AFTER INSERT ON cards BEGIN
+                INSERT INTO cards_fts(rowid, label, holder, notes, code, home_location)
+                VALUES (new.id, new.label, new.holder, new.notes, new.code, new.home_location);
+            END
+            """
+        )
+        c.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_cards_fts_ad AFTER DELETE ON cards BEGIN
+                INSERT INTO cards_fts(cards_fts, rowid, label, holder, notes, code, home_location)
+                VALUES ('delete', old.id, old.label, old.holder, old.notes, old.code, old.home_location);
+            END
+            """
+        )
+        c.execute(
+            """
+            CREATE TRIGGER IF NOT EXISTS trg_cards_fts_au AFTER UPDATE ON cards BEGIN
+                INSERT INTO cards_fts(cards_fts, rowid, label, holder, notes, code, home_location)
+                VALUES ('delete', old.id, old.label, old.holder, old.notes, old.code, old.home_location);
+                INSERT INTO cards_fts(rowid, label, holder, notes, code, home_location)
+                VALUES (new.id, new.label, new.holder, new.notes, new.code, new.home_location);
+            END
+            """
+        )
+        if not existed:
+            c.execute("INSERT INTO cards_fts(cards_fts) VALUES('rebuild')")
+        _cards_fts_enabled = True
+    except sqlite3.OperationalError:
+        _cards_fts_enabled = False
+
+
+def populate_default_cards() -> None:
+    """Seed a preset card set. Uses INSERT OR IGNORE to avoid duplicate seed runs."""
+    # Already populated? Skip the 33 no-op inserts and their index probes.
+    with connect_db() as conn:
+        if conn.execute("SELECT 1 FROM cards LIMIT 1").fetchone():
+            return
+
+    rows = [
+        (f"Lab Visitor {i}", f"{1000 + i:04d}", "119-1 Cabinet" if i <= 4 else "118-2 Cabinet")
+        for i in range(1, 11)
+    ]
+    rows += [
+        (f"Visitor {i}", f"{2000 + i:04d}", "Second Floor Admin" if i <= 10 else "Third Floor Admin")
+        for i in range(1, 21)
+    ]
+    rows += [
+        ("JHSC", "3001", "118-1 Cabinet"),
+        ("PHE 2", "3002", "118-1 Cabinet"),
+        ("Lab Manager Card", "9000", "Lab Manager's Office"),
+    ]
+
+    # One transaction: a single fsync for the whole seed instead of one per row.
+    with connect_db() as conn:
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)",
+                rows,
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        # Refresh planner statistics now that the tables have real data.
+        conn.execute("ANALYZE")
+    _bump_cards_version()
 
 
 def is_first_run() -> bool:
     """Return True if cards table exists but has no entries."""
     try:
-        with connect_db() as conn:
-            c = conn.cursor()
-            c.execute("SELECT COUNT(*) FROM cards")
-            return int(c.fetchone()[0]) == 0
+        # One B-tree seek on the persistent connection; COUNT(*) would
+        # walk the whole index just to compare against zero.
+        return get_conn().execute("SELECT 1 FROM cards LIMIT 1").fetchone() is None
     except sqlite3.Error:
         return True
 
@@ -205,50 +497,172 @@ def ask_first_time_popup(root: tk.Tk) -> None:
 # ======================
 #   DB OPERATIONS
 # ======================
-def fetch_cards(search: str = "", status_filter: str = "All") -> List[Tuple]:
-    with connect_db() as conn:
-        c = conn.cursor()
+# SQL for the hot statements lives in module constants so every call site
+# reuses the exact same string and sqlite3's per-connection statement cache
+# (default 128 entries) always hits instead of re-parsing and re-planning.
+SQL_CARD_EXISTS = "SELECT 1 FROM cards WHERE id=?"
+SQL_GET_CARD_LABEL = "SELECT label FROM cards WHERE id=?"
+SQL_GET_CARD_FORM = "SELECT label, IFNULL(code,''), IFNULL(home_location,'') FROM cards WHERE id=?"
+
+SQL_SIGN_OUT = """
+    UPDATE cards
+       SET status='Out', holder=?, signed_out_at=?, notes=?
+     WHERE id=? AND status='Available'
+    RETURNING label
+"""
 
-        where = []
-        params: List[str] = []
+SQL_INSERT_HISTORY = """
+    INSERT INTO history(card_label, holder, signed_out_at, returned_at, notes)
+    VALUES(?,?,?,?,?)
+"""
 
-        if search.strip():
-            like = f"%{search.strip()}%"
-            where.append(
-                "(label LIKE ? OR holder LIKE ? OR notes LIKE ? OR IFNULL(code,'') LIKE ? OR IFNULL(home_location,'') LIKE ?)"
-            )
-            params.extend([like, like, like, like, like])
-
-        if status_filter in {"Available", "Out", "Lost"}:
-            where.append("status = ?")
-            params.append(status_filter)
-
-        sql = """
-            SELECT id,
-                   IFNULL(code,''),
-                   label,
-                   status,
-                   IFNULL(holder,''),
-                   IFNULL(signed_out_at,''),
-                   CASE WHEN status='Available' THEN IFNULL(home_location,'') ELSE IFNULL(notes,'') END AS display_notes,
-                   IFNULL(home_location,'')
-              FROM cards
-        """
-        if where:
-            sql += " WHERE " + " AND ".join(where)
+SQL_RETURN_CARD = """
+    UPDATE cards
+       SET status='Available', holder=NULL, signed_out_at=NULL, notes=NULL
+     WHERE id=? AND status='Out'
+    RETURNING label
+"""
+
+SQL_CLOSE_HISTORY = """
+    UPDATE history
+       SET returned_at=?
+     WHERE id = (
+         SELECT id FROM history
+          WHERE card_label=? AND returned_at IS NULL
+          ORDER BY id DESC
+          LIMIT 1
+     )
+"""
+
+SQL_MARK_LOST = "UPDATE cards SET status='Lost' WHERE id=? AND status<>'Lost'"
+
+SQL_MARK_FOUND = """
+    UPDATE cards
+       SET status='Available', holder=NULL, signed_out_at=NULL, notes=NULL
+     WHERE id=? AND status='Lost'
+"""
+
+SQL_REMOVE_CARD = "DELETE FROM cards WHERE id=? AND status<>'Out'"
+
+SQL_ADD_CARD = "INSERT INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)"
+
+SQL_EDIT_CARD = "UPDATE cards SET label=?, code=?, home_location=? WHERE id=?"
+
+SQL_SYNC_HISTORY_LABEL = "UPDATE history SET card_label=? WHERE card_label=?"
+
+
+# Version counter for the fetch_cards cache. Every mutation bumps it, which
+# makes all cached result lists stale without having to clear the cache.
+_cards_version = 0
+
+
+def _bump_cards_version() -> None:
+    global _cards_version
+    _cards_version += 1
+
+
+def fetch_cards(search: str = "", status_filter: str = "All") -> List[Tuple]:
+    # Two-part cache key: _cards_version covers this process's own writes,
+    # PRAGMA data_version covers commits from *other* connections — including
+    # other users on a shared drive — so a Refresh really re-reads the DB.
+    data_version = get_conn().execute("PRAGMA data_version").fetchone()[0]
+    return _fetch_cards_cached(_cards_version, data_version, search, status_filter)
+
+
+# Raw columns only: the None -> '' substitution and the notes/home-location
+# choice happen in one Python pass below, which keeps five IFNULLs and a CASE
+# out of SQLite's per-row expression evaluation.
+_FETCH_SELECT = """
+    SELECT id, code, label, status, holder, signed_out_at, notes, home_location
+      FROM cards
+"""
+
+# ?1 binds the pattern once for all five branches, and the NULL guards let
+# SQLite skip the LIKE call outright on rows with no code/home_location
+# instead of materializing '' through IFNULL first.
+_FETCH_WHERE_SEARCH = (
+    "(label LIKE ?1 OR holder LIKE ?1 OR notes LIKE ?1 "
+    "OR (code IS NOT NULL AND code LIKE ?1) "
+    "OR (home_location IS NOT NULL AND home_location LIKE ?1))"
+)
+_FETCH_WHERE_STATUS = "status = ?"
+
+# Natural sort ("Visitor 2" before "Visitor 10") via the generated key
+# columns: the prefix/number split is computed when a label is written, not
+# re-derived per row on every refresh, and idx_cards_sort serves the ORDER BY.
+_FETCH_ORDER = " ORDER BY sort_prefix, sort_num"
+
+# Search served by the FTS5 inverted index when available; the status filter
+# stays a bound parameter on top of it.
+_FETCH_WHERE_FTS = "id IN (SELECT rowid FROM cards_fts WHERE cards_fts MATCH ?)"
+
+_FETCH_FTS_SQL = {
+    False: _FETCH_SELECT + " WHERE " + _FETCH_WHERE_FTS + _FETCH_ORDER,
+    True: (
+        _FETCH_SELECT
+        + " WHERE "
+        + _FETCH_WHERE_FTS
+        + " AND "
+        + _FETCH_WHERE_STATUS
+        + _FETCH_ORDER
+    ),
+}
+
+# All four query shapes (search on/off x status on/off) prebuilt at import
+# time, so no SQL string is ever assembled per call and the statement cache
+# sees the same four texts forever.
+_FETCH_SQL = {
+    (False, False): _FETCH_SELECT + _FETCH_ORDER,
+    (True, False): _FETCH_SELECT + " WHERE " + _FETCH_WHERE_SEARCH + _FETCH_ORDER,
+    (False, True): _FETCH_SELECT + " WHERE " + _FETCH_WHERE_STATUS + _FETCH_ORDER,
+    (True, True): (
+        _FETCH_SELECT
+        + " WHERE "
+        + _FETCH_WHERE_SEARCH
+        + " AND "
+        + _FETCH_WHERE_STATUS
+        + _FETCH_ORDER
+    ),
+}
+
+
+@lru_cache(maxsize=64)
+def _fetch_cards_cached(
+    version: int, data_version: int, search: str, status_filter: str
+) -> List[Tuple]:
+    search = search.strip()
+    has_search = bool(search)
+    has_status = status_filter in {"Available", "Out", "Lost"}
+
+    params: List[str] = []
+    if has_search and _cards_fts_enabled:
+        sql = _FETCH_FTS_SQL[has_status]
+        params.append(_fts_prefix(search))
+    else:
+        sql = _FETCH_SQL[(has_search, has_status)]
+        if has_search:
+            params.append(f"%{search}%")
+    if has_status:
+        params.append(status_filter)
 
+    with connect_db() as conn:
+        c = conn.cursor()
         c.execute(sql, params)
         rows = c.fetchall()
 
-    # Natural sort by label
-    def nat_key(label: str):
-        m = re.search(r"(.*?)(\d+)$", label.strip())
-        if m:
-            return (m.group(1).strip().lower(), int(m.group(2)))
-        return (label.strip().lower(), float("inf"))
-
-    rows.sort(key=lambda r: nat_key(r[2]))
-    return rows
+    return [
+        (
+            r[0],
+            r[1] or "",
+            r[2],
+            r[3],
+            r[4] or "",
+            r[5] or "",
+            (r[7] or "") if r[3] == "Available" else (r[6] or ""),
+            r[7] or "",
+        )
+        for r in rows
+    ]
 
 
 def sign_out_card(card_id: int, holder: str, notes: str = "") -> None:
@@ -257,71 +671,53 @@ def sign_out_card(card_id: int, holder: str, notes: str = "") -> None:
     if not holder:
         raise RuntimeError("Holder name cannot be blank.")
 
+    notes = (notes or "").strip()
     with connect_db() as conn:
         c = conn.cursor()
-        c.execute("SELECT label, status FROM cards WHERE id=?", (card_id,))
+
+        # One explicit transaction: in autocommit mode the UPDATE and the
+        # history INSERT would each flush the WAL separately, and a failure
+        # between them could leave a card Out with no open history row.
+        # BEGIN IMMEDIATE takes the write lock up front; connect_db rolls
+        # back if anything below raises.
+        c.execute("BEGIN IMMEDIATE")
+
+        # Guard and update in one statement: the status check lives in the
+        # WHERE clause and RETURNING hands back the label for the history row,
+        # so there is no SELECT-then-UPDATE race window.
+        c.execute(SQL_SIGN_OUT, (holder, t, notes, card_id))
         row = c.fetchone()
         if not row:
-            raise RuntimeError("Card not found.")
-        label, status = row
-        if status != "Available":
+            c.execute(SQL_CARD_EXISTS, (card_id,))
+            if not c.fetchone():
+                raise RuntimeError("Card not found.")
             raise RuntimeError("Card is not available.")
 
-        c.execute(
-            """
-            UPDATE cards
-               SET status='Out', holder=?, signed_out_at=?, notes=?
-             WHERE id=?
-            """,
-            (holder, t, (notes or "").strip(), card_id),
-        )
-
-        c.execute(
-            """
-            INSERT INTO history(card_label, holder, signed_out_at, returned_at, notes)
-            VALUES(?,?,?,?,?)
-            """,
-            (label, holder, t, None, (notes or "").strip()),
-        )
+        c.execute(SQL_INSERT_HISTORY, (row[0], holder, t, None, notes))
         conn.commit()
+    _bump_cards_version()
 
 
 def return_card(card_id: int) -> None:
     t = now_str()
     with connect_db() as conn:
         c = conn.cursor()
-        c.execute("SELECT label, status FROM cards WHERE id=?", (card_id,))
+        # Same single-transaction pattern as sign_out_card: the status flip
+        # and the history close-out commit together or not at all.
+        c.execute("BEGIN IMMEDIATE")
+        c.execute(SQL_RETURN_CARD, (card_id,))
         row = c.fetchone()
         if not row:
-            raise RuntimeError("Card not found.")
-        label, status = row
-        if status != "Out":
+            c.execute(SQL_CARD_EXISTS, (card_id,))
+            if not c.fetchone():
+                raise RuntimeError("Card not found.")
             raise RuntimeError("Card is not currently out.")
-
-        c.execute(
-            """
-            UPDATE cards
-               SET status='Available', holder=NULL, signed_out_at=NULL, notes=NULL
-             WHERE id=?
-            """,
-            (card_id,),
-        )
+        label = row[0]
 
         # Close latest open history row
-        c.execute(
-            """
-            UPDATE history
-               SET returned_at=?
-             WHERE id = (
-                 SELECT id FROM history
-                  WHERE card_label=? AND returned_at IS NULL
-                  ORDER BY id DESC
-                  LIMIT 1
-             )
-            """,
-            (t, label),
-        )
+        c.execute(SQL_CLOSE_HISTORY, (t, label))
         conn.commit()
+    _bump_cards_version()
 
 
 def mark_lost(card_id: int) -> None:
@@ -331,15 +727,14 @@ def mark_lost(card_id: int) -> None:
     """
     with connect_db() as conn:
         c = conn.cursor()
-        c.execute("SELECT status FROM cards WHERE id=?", (card_id,))
-        row = c.fetchone()
-        if not row:
-            raise RuntimeError("Card not found.")
-        status = row[0]
-        if status == "Lost":
-            return
-        c.execute("UPDATE cards SET status='Lost' WHERE id=?", (card_id,))
+        c.execute(SQL_MARK_LOST, (card_id,))
+        if not c.rowcount:
+            c.execute(SQL_CARD_EXISTS, (card_id,))
+            if not c.fetchone():
+                raise RuntimeError("Card not found.")
+            return  # already Lost
         conn.commit()
+    _bump_cards_version()
 
 
 def mark_found(card_id: int) -> None:
@@ -349,22 +744,14 @@ def mark_found(card_id: int) -> None:
     """
     with connect_db() as conn:
         c = conn.cursor()
-        c.execute("SELECT status FROM cards WHERE id=?", (card_id,))
-        row = c.fetchone()
-        if not row:
-            raise RuntimeError("Card not found.")
-        if row[0] != "Lost":
+        c.execute(SQL_MARK_FOUND, (card_id,))
+        if not c.rowcount:
+            c.execute(SQL_CARD_EXISTS, (card_id,))
+            if not c.fetchone():
+                raise RuntimeError("Card not found.")
             raise RuntimeError("Card is not marked as Lost.")
-
-        c.execute(
-            """
-            UPDATE cards
-               SET status='Available', holder=NULL, signed_out_at=NULL, notes=NULL
-             WHERE id=?
-            """,
-            (card_id,),
-        )
         conn.commit()
+    _bump_cards_version()
 
 
 def add_card(label: str, code: Optional[str], home_location: Optional[str]) -> None:
@@ -374,16 +761,14 @@ def add_card(label: str, code: Optional[str], home_location: Optional[str]) -> N
 
     if not label:
         raise RuntimeError("Card label cannot be blank.")
-    if code and not re.fullmatch(r"\d{4}", code):
+    if code and not valid_code(code):
         raise RuntimeError("Card ID must be exactly 4 digits (or leave blank).")
 
     with connect_db() as conn:
         c = conn.cursor()
-        c.execute(
-            "INSERT INTO cards(label,status,code,home_location) VALUES(?, 'Available', ?, ?)",
-            (label, code, home_location),
-        )
+        c.execute(SQL_ADD_CARD, (label, code, home_location))
         conn.commit()
+    _bump_cards_version()
 
 
 def edit_card(card_id: int, label: str, code: Optional[str], home_location: Optional[str]) -> None:
@@ -393,66 +778,210 @@ def edit_card(card_id: int, label: str, code: Optional[str], home_location: Opti
 
     if not label:
         raise RuntimeError("Card label cannot be blank.")
-    if code and not re.fullmatch(r"\d{4}", code):
+    if code and not valid_code(code):
         raise RuntimeError("Card ID must be exactly 4 digits (or leave blank).")
 
     with connect_db() as conn:
         c = conn.cursor()
-        c.execute("SELECT label FROM cards WHERE id=?", (card_id,))
+        # Same single-transaction pattern as sign_out_card: in autocommit
+        # mode the card UPDATE and the history label sync would commit
+        # separately, and a failure between them would desync the audit
+        # trail (and return_card's open-row lookup, which matches by label).
+        c.execute("BEGIN IMMEDIATE")
+        c.execute(SQL_GET_CARD_LABEL, (card_id,))
         row = c.fetchone()
         if not row:
             raise RuntimeError("Card not found.")
         old_label = row[0]
 
-        c.execute(
-            "UPDATE cards SET label=?, code=?, home_location=? WHERE id=?",
-            (label, code, home_location, card_id),
-        )
+        c.execute(SQL_EDIT_CARD, (label, code, home_location, card_id))
 
         # Keep history consistent if label changes
         if old_label != label:
-            c.execute("UPDATE history SET card_label=? WHERE card_label=?", (label, old_label))
+            c.execute(SQL_SYNC_HISTORY_LABEL, (label, old_label))
 
         conn.commit()
+    _bump_cards_version()
 
 
 def remove_card(card_id: int) -> None:
     with connect_db() as conn:
         c = conn.cursor()
-        c.execute("SELECT status FROM cards WHERE id=?", (card_id,))
-        row = c.fetchone()
-        if not row:
-            raise RuntimeError("Card not found.")
-        if row[0] == "Out":
+        c.execute(SQL_REMOVE_CARD, (card_id,))
+        if not c.rowcount:
+            c.execute(SQL_CARD_EXISTS, (card_id,))
+            if not c.fetchone():
+                raise RuntimeError("Card not found.")
             raise RuntimeError("Card is currently Out. Return it first.")
-        c.execute("DELETE FROM cards WHERE id=?", (card_id,))
         conn.commit()
+    _bump_cards_version()
+
 
+def _fts_prefix(text: str) -> str:
+    """Quote user text as a single FTS5 phrase-prefix term."""
+    return '"' + text.replace('"', '""') + '"*'
 
-def fetch_history(card_label_filter: str = "", holder_filter: str = "") -> List[tuple]:
+
+# Fixed history query texts (one per filter shape) so the statement cache
+# hits instead of re-parsing concatenated SQL. Every shape pages by keyset:
+# "id < ?" with the last delivered id makes the ORDER BY id DESC walk start
+# at the right leaf, O(page) per request instead of O(rows skipped).
+_HIST_SELECT = """
+    SELECT id, card_label, holder, signed_out_at, IFNULL(returned_at,''), IFNULL(notes,'')
+      FROM history
+"""
+_HIST_TAIL = " AND id < ? ORDER BY id DESC LIMIT ?"
+
+_HIST_SQL = {
+    (False, False): _HIST_SELECT + " WHERE 1=1" + _HIST_TAIL,
+    (True, False): _HIST_SELECT + " WHERE card_label LIKE ?" + _HIST_TAIL,
+    (False, True): _HIST_SELECT + " WHERE holder LIKE ?" + _HIST_TAIL,
+    (True, True): _HIST_SELECT + " WHERE card_label LIKE ? AND holder LIKE ?" + _HIST_TAIL,
+}
+
+_HIST_FTS_SQL = (
+    _HIST_SELECT
+    + " WHERE id IN (SELECT rowid FROM history_fts WHERE history_fts MATCH ?)"
+    + _HIST_TAIL
+)
+
+# First page: no lower ceiling yet. Larger than any rowid SQLite can assign.
+_HIST_NO_CEILING = 2**63 - 1
+
+HISTORY_PAGE = 500
+
+
+def _history_cursor(
+    conn: sqlite3.Connection,
+    card_label_filter: str,
+    holder_filter: str,
+    last_seen_id: Optional[int] = None,
+    limit: int = -1,
+) -> sqlite3.Cursor:
+    """Execute the history query for the given filters and return its cursor.
+
+    Rows come back newest-first with the id as the first column; pass the id
+    of the last row received as last_seen_id to continue where a page ended.
+    limit=-1 streams everything (SQLite treats a negative LIMIT as unbounded).
+    """
+    c = conn.cursor()
+    ceiling = _HIST_NO_CEILING if last_seen_id is None else last_seen_id
+
+    if (card_label_filter or holder_filter) and _history_fts_enabled:
+        # Inverted-index lookup instead of LIKE scans over all of history.
+        terms = []
+        if card_label_filter:
+            terms.append("card_label:" + _fts_prefix(card_label_filter))
+        if holder_filter:
+            terms.append("holder:" + _fts_prefix(holder_filter))
+        c.execute(_HIST_FTS_SQL, (" AND ".join(terms), ceiling, limit))
+        return c
+
+    params: List = []
+    if card_label_filter:
+        params.append(f"%{card_label_filter}%")
+    if holder_filter:
+        params.append(f"%{holder_filter}%")
+    params.extend((ceiling, limit))
+    c.execute(_HIST_SQL[(bool(card_label_filter), bool(holder_filter))], params)
+    return c
+
+
+def fetch_history_iter(card_label_filter: str = "", holder_filter: str = "") -> Iterable[tuple]:
+    """Stream history rows one at a time — O(1) memory for large exports."""
     with connect_db() as conn:
-        c = conn.cursor()
-        base = """
-            SELECT card_label, holder, signed_out_at, IFNULL(returned_at,''), IFNULL(notes,'')
-              FROM history
-        """
-        params: List[str] = []
-        if card_label_filter or holder_filter:
-            base += " WHERE 1=1"
-            if card_label_filter:
-                base += " AND card_label LIKE ?"
-                params.append(f"%{card_label_filter}%")
-            if holder_filter:
-                base += " AND holder LIKE ?"
-                params.append(f"%{holder_filter}%")
-        base += " ORDER BY id DESC"
-        c.execute(base, params)
-        return c.fetchall()
+        for r in _history_cursor(conn, card_label_filter.strip(), holder_filter.strip()):
+            yield r[1:]
+
+
+def fetch_history_page(
+    card_label_filter: str = "",
+    holder_filter: str = "",
+    last_seen_id: Optional[int] = None,
+    limit: int = HISTORY_PAGE,
+) -> List[tuple]:
+    """One page of history rows, ids included, for the History window."""
+    with connect_db() as conn:
+        cur = _history_cursor(
+            conn, card_label_filter.strip(), holder_filter.strip(), last_seen_id, limit
+        )
+        return cur.fetchall()
 
 
 # ======================
 #   UI
 # ======================
+# Row tag tuples by status, shared by every refresh: one dict lookup per row
+# instead of branching and building a fresh list/tuple each time.
+_STATUS_TAGS = {"Out": ("out",), "Lost": ("lost",)}
+_NO_TAGS: Tuple[str, ...] = ()
+
+# ttk styles are process-global; configure them once rather than per window.
+_styles_inited = False
+
+
+def _init_styles(root: tk.Misc) -> None:
+    global _styles_inited
+    if _styles_inited:
+        return
+    style = ttk.Style(root)
+    style.map("Treeview", background=[("selected", "#cce5ff")])
+    _styles_inited = True
+
+
+class _CardFormDialog(tk.Toplevel):
+    """Modal label/ID/location form shared by Add Card and Edit Card."""
+
+    def __init__(self, parent, title: str, initial: Tuple[str, str, str], on_save) -> None:
+        super().__init__(parent)
+        self.title(title)
+        self.resizable(False, False)
+        self._on_save = on_save
+
+        tk.Label(self, text="Card Label:").grid(row=0, column=0, sticky="e", padx=10, pady=(12, 6))
+        tk.Label(self, text="Card ID (4 digits):").grid(row=1, column=0, sticky="e", padx=10, pady=6)
+        tk.Label(self, text="Home Location:").grid(row=2, column=0, sticky="e", padx=10, pady=6)
+
+        self.label_var = tk.StringVar(value=initial[0])
+        self.code_var = tk.StringVar(value=initial[1])
+        self.home_var = tk.StringVar(value=initial[2])
+
+        label_entry = tk.Entry(self, textvariable=self.label_var, width=36)
+        label_entry.grid(row=0, column=1, sticky="w", padx=10, pady=(12, 6))
+        tk.Entry(self, textvariable=self.code_var, width=12).grid(row=1, column=1, sticky="w", padx=10, pady=6)
+        tk.Entry(self, textvariable=self.home_var, width=36).grid(row=2, column=1, sticky="w", padx=10, pady=6)
+
+        tk.Button(self, text="Cancel", command=self.destroy).grid(row=3, column=0, pady=12, padx=10, sticky="w")
+        tk.Button(self, text="Save", command=self._do_save).grid(row=3, column=1, pady=12, padx=10, sticky="e")
+
+        self.grab_set()
+        label_entry.focus_set()
+        self.wait_window()
+
+    def _do_save(self) -> None:
+        label = self.label_var.get().strip()
+        code = self.code_var.get().strip() or None
+        home = self.home_var.get().strip() or None
+        if code and not valid_code(code):
+            messagebox.showerror(
+                "Invalid ID", "Card ID must be exactly 4 digits (or leave blank).", parent=self
+            )
+            return
+        try:
+            self._on_save(label, code, home)
+            self.destroy()
+        except sqlite3.IntegrityError as e:
+            msg = str(e)
+            if "UNIQUE constraint failed: cards.label" in msg:
+                messagebox.showerror("Duplicate", f"A card named '{label}' already exists.", parent=self)
+            elif "idx_cards_code_unique" in msg or "cards.code" in msg:
+                messagebox.showerror("Duplicate", f"A card with ID '{code}' already exists.", parent=self)
+            else:
+                messagebox.showerror("Error", msg, parent=self)
+        except Exception as e:
+            messagebox.showerror("Error", str(e), parent=self)
+
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -461,14 +990,25 @@ class App(tk.Tk):
         self.minsize(920, 480)
 
         try:
-            self.iconbitmap(resource_path("icon.ico"))
+            self.iconbitmap(ICON_PATH)
         except Exception:
             pass
 
-        self._build_menu()
+        self._refresh_seq = 0
+        self._refresh_job = None  # pending debounce timer id
+        self._last_query = None  # (search, status) of the newest issued fetch
+        self._row_cache: dict = {}  # dbid -> (values, tags) as last shown
+        self._cards_by_id: dict = {}  # dbid -> full fetch row, incl. home
+
         self._build_toolbar()
         self._build_table()
-        self.refresh()
+        # The menubar is not part of the client area; building it after the
+        # first paint shaves a few dozen Tcl calls off perceived launch time.
+        self.after_idle(self._build_menu)
+        # Paint the empty window first; the initial query fills it in once
+        # the event loop is running.
+        self.after_idle(self.refresh)
+        self.after(60000, self._wal_checkpoint)
 
     def _build_menu(self) -> None:
         menubar = tk.Menu(self)
@@ -501,7 +1041,10 @@ class App(tk.Tk):
         self.search_var = tk.StringVar()
         self.search_entry = tk.Entry(bar, textvariable=self.search_var, width=28)
         self.search_entry.pack(side="left", padx=(4, 10))
-        self.search_entry.bind("<Return>", lambda _e: self.refresh())
+        # Live filter: keystrokes coalesce through a 150 ms debounce so fast
+        # typing issues one query, not one per character.
+        self.search_entry.bind("<KeyRelease>", lambda _e: self._schedule_refresh())
+        self.search_entry.bind("<Return>", lambda _e: self._schedule_refresh(0))
 
         tk.Label(bar, text="Status:").pack(side="left")
         self.status_var = tk.StringVar(value="All")
@@ -509,7 +1052,7 @@ class App(tk.Tk):
             bar, textvariable=self.status_var, values=["All", "Available", "Out", "Lost"], width=12, state="readonly"
         )
         self.status_combo.pack(side="left", padx=(4, 10))
-        self.status_combo.bind("<<ComboboxSelected>>", lambda _e: self.refresh())
+        self.status_combo.bind("<<ComboboxSelected>>", lambda _e: self._schedule_refresh(0))
 
         tk.Button(bar, text="Refresh", command=self.refresh).pack(side="left", padx=2)
         tk.Button(bar, text="Sign Out", command=self.sign_out_selected).pack(side="left", padx=2)
@@ -522,7 +1065,7 @@ class App(tk.Tk):
         tk.Button(bar, text="History", command=self.open_history).pack(side="right", padx=2)
 
     def _build_table(self) -> None:
-        cols = ("dbid", "code", "label", "status", "holder", "signed_out_at", "notes")
+        cols = ("code", "label", "status", "holder", "signed_out_at", "notes")
         self.tree = ttk.Treeview(self, columns=cols, show="headings")
 
         self.tree.heading("code", text="ID")
@@ -538,57 +1081,105 @@ class App(tk.Tk):
         self.tree.heading("notes", text="Notes / Location")
         self.tree.column("notes", width=320, anchor="w")
 
-        # hide dbid
-        self.tree.heading("dbid", text="dbid")
-        self.tree.column("dbid", width=0, minwidth=0, stretch=False)
-
         self.tree.pack(fill="both", expand=True, padx=8, pady=(0, 8))
         self.tree.bind("<Double-1>", self.on_double_click)
 
-        style = ttk.Style(self)
-        style.map("Treeview", background=[("selected", "#cce5ff")])
+        _init_styles(self)
         self.tree.tag_configure("out", background="#fff3cd")   # light amber
         self.tree.tag_configure("lost", background="#f8d7da")  # light red
 
+    def _wal_checkpoint(self) -> None:
+        """Periodically truncate the WAL so it stays small on shared drives."""
+        _db_executor.submit(_checkpoint_wal)
+        self.after(60000, self._wal_checkpoint)
+
+    def _schedule_refresh(self, delay_ms: int = 150) -> None:
+        """Coalesce rapid refresh triggers (typing) into one query."""
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        self._refresh_job = self.after(delay_ms, self._run_scheduled_refresh)
+
+    def _run_scheduled_refresh(self) -> None:
+        self._refresh_job = None
+        # Keystrokes that don't change the query (arrows, modifiers, Enter
+        # after typing) would otherwise re-issue an identical fetch.
+        if (self.search_var.get().strip(), self.status_var.get()) == self._last_query:
+            return
+        self.refresh()
+
     def refresh(self) -> None:
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        # Query on the DB worker; only the newest in-flight request may
+        # touch the table once it lands back on the Tk thread. The Refresh
+        # button lands here directly so it always re-reads the shared DB.
+        self._last_query = (self.search_var.get().strip(), self.status_var.get())
+        self._refresh_seq += 1
+        seq = self._refresh_seq
+        fetch_cards_async(
+            self.search_var.get(),
+            self.status_var.get(),
+            self,
+            lambda rows: self._apply_rows(seq, rows),
+        )
 
-        rows = fetch_cards(self.search_var.get(), self.status_var.get())
-        for r in rows:
-            dbid, code, label, status, holder, signed_out_at, display_notes, _home = r
-            tags: List[str] = []
-            if status == "Out":
-                tags.append("out")
-            elif status == "Lost":
-                tags.append("lost")
-
-            self.tree.insert(
-                "",
-                "end",
-                values=(dbid, code, label, status, holder, signed_out_at, display_notes),
-                tags=tuple(tags),
-            )
+    def _apply_rows(self, seq: int, rows: List[Tuple]) -> None:
+        if seq != self._refresh_seq:
+            return  # superseded by a newer refresh
+
+        # Diff against the previous state instead of rebuilding the whole
+        # Treeview: delete vanished rows, insert new ones, and rewrite only
+        # rows whose values or tags actually changed. Rows use the dbid as
+        # their iid, so selection survives a refresh too.
+        # Full rows by id, so per-click paths (Edit) read from here instead
+        # of re-querying the DB for data this refresh just fetched.
+        self._cards_by_id = {r[0]: r for r in rows}
+
+        cache = self._row_cache
+        new_ids = [r[0] for r in rows]
+        new_id_set = set(new_ids)
+
+        for dbid in [d for d in cache if d not in new_id_set]:
+            self.tree.delete(str(dbid))
+            del cache[dbid]
+
+        for idx, r in enumerate(rows):
+            # The dbid (r[0]) is the row's iid, not a (hidden) column, so Tk
+            # never measures or lays it out; the displayed values are the
+            # middle slice handed to Tk as-is, no per-row unpack/repack.
+            # r[7] (home_location) is carried for the edit dialog, not shown.
+            dbid = r[0]
+            values = r[1:7]
+            entry = (values, _STATUS_TAGS.get(r[3], _NO_TAGS))
+            cached = cache.get(dbid)
+            if cached is None:
+                self.tree.insert("", idx, iid=str(dbid), values=values, tags=entry[1])
+                cache[dbid] = entry
+            elif cached != entry:
+                self.tree.item(str(dbid), values=values, tags=entry[1])
+                cache[dbid] = entry
+
+        # Fix ordering for rows that moved (natural-sort position changes
+        # on rename, for example). Untouched rows cost one index lookup.
+        for idx, dbid in enumerate(new_ids):
+            iid = str(dbid)
+            if self.tree.index(iid) != idx:
+                self.tree.move(iid, "", idx)
 
     def _get_selected_dbid(self) -> Optional[int]:
         sel = self.tree.selection()
-        if not sel:
-            return None
-        vals = self.tree.item(sel[0], "values")
-        return int(vals[0]) if vals else None
+        return int(sel[0]) if sel else None
+
+    def _selected_row(self) -> Optional[tuple]:
+        """Displayed values of the selected row (code, label, status, ...)."""
+        sel = self.tree.selection()
+        return self.tree.item(sel[0], "values") if sel else None
 
     def on_double_click(self, _event=None) -> None:
-        dbid = self._get_selected_dbid()
-        if not dbid:
-            return
-        with connect_db() as conn:
-            c = conn.cursor()
-            c.execute("SELECT label, status FROM cards WHERE id=?", (dbid,))
-            row = c.fetchone()
-        if not row:
+        vals = self._selected_row()
+        if not vals:
             return
 
-        _label, status = row
+        # Status is already on screen; no need to re-query the DB per click.
+        status = vals[2]
         if status == "Available":
             self.sign_out_selected()
         elif status == "Out":
@@ -598,19 +1189,12 @@ class App(tk.Tk):
 
     def sign_out_selected(self) -> None:
         dbid = self._get_selected_dbid()
-        if not dbid:
+        vals = self._selected_row()
+        if not dbid or not vals:
             messagebox.showwarning("No selection", "Select a card first.")
             return
 
-        with connect_db() as conn:
-            c = conn.cursor()
-            c.execute("SELECT label, status FROM cards WHERE id=?", (dbid,))
-            row = c.fetchone()
-        if not row:
-            messagebox.showerror("Error", "Card not found.")
-            return
-
-        label, status = row
+        label, status = vals[1], vals[2]
         if status != "Available":
             messagebox.showwarning("Unavailable", f"{label} is {status}.")
             return
@@ -687,48 +1271,11 @@ class App(tk.Tk):
                 messagebox.showerror("Error", str(e))
 
     def add_card_dialog(self) -> None:
-        dlg = tk.Toplevel(self)
-        dlg.title("Add Card")
-        dlg.resizable(False, False)
-
-        tk.Label(dlg, text="Card Label:").grid(row=0, column=0, sticky="e", padx=10, pady=(12, 6))
-        tk.Label(dlg, text="Card ID (4 digits):").grid(row=1, column=0, sticky="e", padx=10, pady=6)
-        tk.Label(dlg, text="Home Location:").grid(row=2, column=0, sticky="e", padx=10, pady=6)
-
-        label_var = tk.StringVar()
-        code_var = tk.StringVar()
-        home_var = tk.StringVar()
-
-        label_entry = tk.Entry(dlg, textvariable=label_var, width=36)
-        label_entry.grid(row=0, column=1, sticky="w", padx=10, pady=(12, 6))
-        tk.Entry(dlg, textvariable=code_var, width=12).grid(row=1, column=1, sticky="w", padx=10, pady=6)
-        tk.Entry(dlg, textvariable=home_var, width=36).grid(row=2, column=1, sticky="w", padx=10, pady=6)
-
-        def do_save() -> None:
-            label = label_var.get().strip()
-            code = code_var.get().strip() or None
-            home = home_var.get().strip() or None
-            try:
-                add_card(label, code, home)
-                dlg.destroy()
-                self.refresh()
-            except sqlite3.IntegrityError as e:
-                msg = str(e)
-                if "UNIQUE constraint failed: cards.label" in msg:
-                    messagebox.showerror("Duplicate", f"A card named '{label}' already exists.", parent=dlg)
-                elif "idx_cards_code_unique" in msg or "cards.code" in msg:
-                    messagebox.showerror("Duplicate", f"A card with ID '{code}' already exists.", parent=dlg)
-                else:
-                    messagebox.showerror("Error", msg, parent=dlg)
-            except Exception as e:
-                messagebox.showerror("Error", str(e), parent=dlg)
+        def save(label, code, home):
+            add_card(label, code, home)
+            self.refresh()
 
-        tk.Button(dlg, text="Cancel", command=dlg.destroy).grid(row=3, column=0, pady=12, padx=10, sticky="w")
-        tk.Button(dlg, text="Save", command=do_save).grid(row=3, column=1, pady=12, padx=10, sticky="e")
-
-        dlg.grab_set()
-        label_entry.focus_set()
-        dlg.wait_window()
+        _CardFormDialog(self, "Add Card", ("", "", ""), save)
 
     def edit_selected(self) -> None:
         dbid = self._get_selected_dbid()
@@ -736,58 +1283,23 @@ class App(tk.Tk):
             messagebox.showwarning("No selection", "Select a card first.")
             return
 
-        with connect_db() as conn:
-            c = conn.cursor()
-            c.execute("SELECT label, IFNULL(code,''), IFNULL(home_location,'') FROM cards WHERE id=?", (dbid,))
-            row = c.fetchone()
-        if not row:
-            messagebox.showerror("Error", "Card not found.")
-            return
-
-        cur_label, cur_code, cur_home = row
-
-        dlg = tk.Toplevel(self)
-        dlg.title("Edit Card")
-        dlg.resizable(False, False)
-
-        tk.Label(dlg, text="Card Label:").grid(row=0, column=0, sticky="e", padx=10, pady=(12, 6))
-        tk.Label(dlg, text="Card ID (4 digits):").grid(row=1, column=0, sticky="e", padx=10, pady=6)
-        tk.Label(dlg, text="Home Location:").grid(row=2, column=0, sticky="e", padx=10, pady=6)
-
-        label_var = tk.StringVar(value=cur_label)
-        code_var = tk.StringVar(value=cur_code)
-        home_var = tk.StringVar(value=cur_home)
-
-        label_entry = tk.Entry(dlg, textvariable=label_var, width=36)
-        label_entry.grid(row=0, column=1, sticky="w", padx=10, pady=(12, 6))
-        tk.Entry(dlg, textvariable=code_var, width=12).grid(row=1, column=1, sticky="w", padx=10, pady=6)
-        tk.Entry(dlg, textvariable=home_var, width=36).grid(row=2, column=1, sticky="w", padx=10, pady=6)
-
-        def do_save() -> None:
-            label = label_var.get().strip()
-            code = code_var.get().strip() or None
-            home = home_var.get().strip() or None
-            try:
-                edit_card(dbid, label, code, home)
-                dlg.destroy()
-                self.refresh()
-            except sqlite3.IntegrityError as e:
-                msg = str(e)
-                if "UNIQUE constraint failed: cards.label" in msg:
-                    messagebox.showerror("Duplicate", f"A card named '{label}' already exists.", parent=dlg)
-                elif "idx_cards_code_unique" in msg or "cards.code" in msg:
-                    messagebox.showerror("Duplicate", f"A card with ID '{code}' already exists.", parent=dlg)
-                else:
-                    messagebox.showerror("Error", msg, parent=dlg)
-            except Exception as e:
-                messagebox.showerror("Error", str(e), parent=dlg)
+        r = self._cards_by_id.get(dbid)
+        if r is not None:
+            initial = (r[2], r[1], r[7])  # label, code, home from last fetch
+        else:
+            # Single read-only statement: conn.execute goes straight through
+            # the statement cache, no throwaway cursor or context block.
+            row = get_conn().execute(SQL_GET_CARD_FORM, (dbid,)).fetchone()
+            if not row:
+                messagebox.showerror("Error", "Card not found.")
+                return
+            initial = row
 
-        tk.Button(dlg, text="Cancel", command=dlg.destroy).grid(row=3, column=0, pady=12, padx=10, sticky="w")
-        tk.Button(dlg, text="Save", command=do_save).grid(row=3, column=1, pady=12, padx=10, sticky="e")
+        def save(label, code, home):
+            edit_card(dbid, label, code, home)
+            self.refresh()
 
-        dlg.grab_set()
-        label_entry.focus_set()
-        dlg.wait_window()
+        _CardFormDialog(self, "Edit Card", initial, save)
 
     def remove_selected(self) -> None:
         dbid = self._get_selected_dbid()
@@ -875,14 +1387,65 @@ class HistoryWindow(tk.Toplevel):
             self.tree.column(col, width=160 if col != "notes" else 260, anchor="w")
         self.tree.pack(fill="both", expand=True, padx=8, pady=(0, 8))
 
+        # Keyset paging: only HISTORY_PAGE rows load at a time; scrolling near
+        # the bottom fetches the next page below the last id already shown.
+        self.tree.configure(yscrollcommand=self._on_scroll)
+
+        self._refresh_seq = 0
+        self._last_id: Optional[int] = None
+        self._exhausted = False
+        self._loading = False
         self.refresh()
 
     def refresh(self) -> None:
-        for i in self.tree.get_children():
-            self.tree.delete(i)
-        rows = fetch_history(self.card_filter.get().strip(), self.holder_filter.get().strip())
+        # Same pattern as the main window: query on the DB worker, apply the
+        # newest result on the Tk thread. Keeps this window (and the rest of
+        # the app) responsive when history is large or the drive is slow.
+        self._refresh_seq += 1
+        self._last_id = None
+        self._exhausted = False
+        self._loading = True
+        seq = self._refresh_seq
+        fetch_history_async(
+            self.card_filter.get().strip(),
+            self.holder_filter.get().strip(),
+            None,
+            self,
+            lambda rows: self._apply_rows(seq, rows, clear=True),
+        )
+
+    def _on_scroll(self, first: str, last: str) -> None:
+        # yscrollcommand fires on any view change; near the bottom, top up.
+        if float(last) > 0.9:
+            self._load_more()
+
+    def _load_more(self) -> None:
+        if self._loading or self._exhausted:
+            return
+        self._loading = True
+        seq = self._refresh_seq
+        fetch_history_async(
+            self.card_filter.get().strip(),
+            self.holder_filter.get().strip(),
+            self._last_id,
+            self,
+            lambda rows: self._apply_rows(seq, rows),
+        )
+
+    def _apply_rows(self, seq: int, rows: List[tuple], clear: bool = False) -> None:
+        if seq != self._refresh_seq:
+            return
+        self._loading = False
+        if clear:
+            children = self.tree.get_children()
+            if children:
+                self.tree.delete(*children)  # one Tcl call instead of one per row
         for r in rows:
-            self.tree.insert("", "end", values=r)
+            self.tree.insert("", "end", values=r[1:])  # r[0] is the keyset id
+        if rows:
+            self._last_id = rows[-1][0]
+        if len(rows) < HISTORY_PAGE:
+            self._exhausted = True
 
     def export_csv(self) -> None:
         path = filedialog.asksaveasfilename(
@@ -893,16 +1456,34 @@ class HistoryWindow(tk.Toplevel):
         if not path:
             return
 
-        rows = fetch_history(self.card_filter.get().strip(), self.holder_filter.get().strip())
-
-        import csv
-
-        with open(path, "w", newline="", encoding="utf-8-sig") as f:
-            w = csv.writer(f)
-            w.writerow(["card_label", "holder", "signed_out_at", "returned_at", "notes"])
-            w.writerows(rows)
+        card = self.card_filter.get().strip()
+        holder = self.holder_filter.get().strip()
+
+        # Fetch and write on the DB worker so a big export doesn't freeze
+        # the UI; only the result popup runs back on the Tk thread.
+        def _export() -> None:
+            import csv
+
+            # Stream cursor -> csv with a 1MB write buffer (exports often go
+            # to a network share, so fewer write() syscalls matter) and let
+            # writerows drive the iterator in C. Nothing materializes a
+            # full-history list.
+            with open(path, "w", newline="", encoding="utf-8-sig", buffering=1 << 20) as f:
+                w = csv.writer(f)
+                w.writerow(["card_label", "holder", "signed_out_at", "returned_at", "notes"])
+                w.writerows(fetch_history_iter(card, holder))
+
+        def _done(f) -> None:
+            exc = f.exception()
+            try:
+                if exc is not None:
+                    self.after(0, messagebox.showerror, "Export failed", str(exc))
+                else:
+                    self.after(0, messagebox.showinfo, "Exported", f"Saved: {path}")
+            except tk.TclError:
+                pass
 
-        messagebox.showinfo("Exported", f"Saved: {path}")
+        _db_executor.submit(_export).add_done_callback(_done)
 
 
 def main() -> None: